@@ -1,13 +1,40 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Response
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import pandas as pd
-import numpy as np
+import bisect
+import copy
+import heapq
+import importlib
 import io
 import json
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
-app = FastAPI()
+def warm_up():
+    """Load the heavy libraries and build the template outside the request path."""
+    try:
+        for module in ("pandas", "openpyxl", "docx"):
+            importlib.import_module(module)
+        get_template_bytes()
+    except Exception as e:
+        print(f"Warm-up failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Run in the background so the server accepts requests right away;
+    # set GCMM_WARMUP=0 on platforms that freeze the process between requests
+    if os.environ.get("GCMM_WARMUP", "1") != "0":
+        threading.Thread(target=warm_up, daemon=True).start()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -16,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # Versions for If-Match on writes
 )
 
 # In-memory storage (replace with database in production)
@@ -23,9 +51,49 @@ gcmm_data = {
     "axes": [],
     "domains": [],
     "objectives": [],
-    "globalScore": 0
+    "globalScore": 0,
+    "version": 0
 }
 
+# Published stores and indexes are never modified. Writers build new ones (copying
+# only what they change) and swap the references in while holding store_lock, which
+# only serializes writers: readers take the current reference once and never wait.
+store_lock = threading.RLock()
+
+# Column layout of the GCMM workbook (template, uploads and exports)
+GCMM_COLUMNS = [
+    "#Axis",
+    "Axis",
+    "#Domain",
+    "Domain",
+    "Domain Description",
+    "Obj. ID",
+    "Objective",
+    "Description",
+    "Level 1 (Ad hoc)",
+    "Level 2 (Initiated)",
+    "Level 3 (Defined)",
+    "Level 4 (Managed)",
+    "Level 5 (Optimized)",
+    "Profil",
+    "Target Profil",
+    "Comment",
+    "Actionable Recommendation for Level 1",
+    "Strategic Recommendation for Level 1",
+    "Actionable Recommendation for Level 2",
+    "Strategic Recommendation for Level 2",
+    "Actionable Recommendation for Level 3",
+    "Strategic Recommendation for Level 3",
+    "Actionable Recommendation for Level 4",
+    "Strategic Recommendation for Level 4"
+]
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# The template workbook never changes, so it is built once and served from memory
+_template_bytes = None
+_template_lock = threading.Lock()
+
 # Color mapping for axes
 axis_colors = [
     "#3366CC",  # Axis 1 - Legal (Blue)
@@ -35,145 +103,986 @@ axis_colors = [
     "#990099"   # Axis 5 - Cooperation (Purple)
 ]
 
-def validate_excel_structure(df):
-    """Validate the structure of the uploaded Excel file."""
-    # Expected columns
-    required_columns = [
-        '#Axis',           # Column 0
-        'Axis',       # Column 1
-        '#Domain',       # Column 2
-        'Domain',   # Column 3
-        'Domain Description',   # Column 4
-        'Obj. ID',      # Column 5
-        'Objective',  # Column 6
-        'Description',   # Column 7 
-        'Level 1 (Ad hoc)',      # Column 8
-        'Level 2 (Initiated)',      # Column 9
-        'Level 3 (Defined)',      # Column 10
-        'Level 4 (Managed)',      # Column 11
-        'Level 5 (Optimized)',      # Column 12
-        'Profil',    # Column 13
-        'Target Profil',      # Column 14
-        'Comment'    # Column 15
+# Fields read from an upload: canonical header, accepted header spellings
+# (compared after normalize_header) and the dtype every reader yields
+UPLOAD_FIELDS = {
+    "axis_id": ("#Axis", ["#axis", "axis id", "#axe"], "float64"),
+    "axis_name": ("Axis", ["axis", "axe"], "str"),
+    "domain_id": ("#Domain", ["#domain", "#dom", "domain id"], "str"),
+    "domain_name": ("Domain", ["domain", "domaine"], "str"),
+    "domain_description": ("Domain Description", ["domain description"], "str"),
+    "objective_id": ("Obj. ID", ["obj. id", "obj id", "#obj", "objective id"], "str"),
+    "objective_name": ("Objective", ["objective", "objectve", "objectif"], "str"),
+    "description": ("Description", ["description"], "str"),
+    "profile": ("Profil", ["profil", "profile", "evaluation"], "float64"),
+    "target_profile": ("Target Profil", ["target profil", "target profile"], "float64"),
+    "comment": ("Comment", ["comment", "comments", "commentaire"], "str")
+}
+for level in range(1, 6):
+    UPLOAD_FIELDS[f"level{level}"] = (GCMM_COLUMNS[7 + level], [], "str")
+    UPLOAD_FIELDS[f"actionable{level}"] = (f"Actionable Recommendation for Level {level}", [], "str")
+    UPLOAD_FIELDS[f"strategic{level}"] = (f"Strategic Recommendation for Level {level}", [], "str")
+
+REQUIRED_UPLOAD_FIELDS = ["axis_id", "domain_id", "domain_name", "objective_id", "objective_name"]
+
+# "Actionable Recommendation for Level 2", "Level 3 (Defined)", "3 – Defined"
+RECOMMENDATION_HEADER = re.compile(r"^(actionable|strategic)\b.*\blevel\s*([1-5])\b")
+LEVEL_HEADER = re.compile(r"^(?:level\s*([1-5])\b|([1-5])\s*[-–—])")
+
+def id_text(value):
+    """Ids as text; numeric ids (Parquet/Arrow columns with gaps come back as floats) lose the '.0'."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def normalize_header(header):
+    return " ".join(str(header).strip().lower().split())
+
+def is_unnamed_header(header):
+    """Blank header cell, as read directly or as named by pandas ("Unnamed: 1")."""
+    return header is None or normalize_header(header) in ("", "none") or normalize_header(header).startswith("unnamed:")
+
+class ColumnResolver:
+    """Maps the header of an upload to the GCMM fields.
+
+    Columns may come in any order and extra columns are ignored; the first
+    column matching a field wins. Readers map the header row first, then read
+    only ``usecols`` and cast them to ``dtypes`` (``convert`` does it for readers
+    that take no dtypes), so every format yields the same values.
+    """
+
+    _aliases = {alias: field for field, (_, aliases, _) in UPLOAD_FIELDS.items() for alias in aliases}
+
+    def __init__(self):
+        self.columns = {}
+
+    def field_for(self, header):
+        name = normalize_header(header)
+        match = RECOMMENDATION_HEADER.match(name)
+        if match:
+            return f"{match.group(1)}{match.group(2)}"
+        match = LEVEL_HEADER.match(name)
+        if match:
+            return f"level{match.group(1) or match.group(2)}"
+        return self._aliases.get(name)
+
+    def resolve(self, headers):
+        headers = list(headers)
+        for header in headers:
+            field = self.field_for(header)
+            if field is not None:
+                self.columns.setdefault(field, header)
+
+        # A blank header right after #Axis holds the axis names (as in the sample workbook)
+        if "axis_name" not in self.columns and "axis_id" in self.columns:
+            position = headers.index(self.columns["axis_id"]) + 1
+            if position < len(headers) and is_unnamed_header(headers[position]):
+                self.columns["axis_name"] = headers[position]
+        return self
+
+    @property
+    def usecols(self):
+        return list(self.columns.values())
+
+    @property
+    def dtypes(self):
+        return {header: UPLOAD_FIELDS[field][2] for field, header in self.columns.items()}
+
+    def check_required(self):
+        missing = [UPLOAD_FIELDS[field][0] for field in REQUIRED_UPLOAD_FIELDS if field not in self.columns]
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing required columns: {', '.join(missing)}"
+            )
+
+    def convert(self, df):
+        """Cast the selected columns to ``dtypes``: numbers with pd.to_numeric, text as id_text.
+
+        Missing values become NaN, as the pandas readers give them.
+        """
+        import pandas as pd
+
+        for header, dtype in self.dtypes.items():
+            if dtype == "float64":
+                df[header] = pd.to_numeric(df[header]).astype("float64")
+            else:
+                values = df[header].astype(object)
+                df[header] = values.map(id_text, na_action="ignore").where(values.notna(), math.nan)
+        return df
+
+    def to_fields(self, df):
+        """Rename the selected columns to field names and add the optional ones that are absent."""
+        df = df.rename(columns={header: field for field, header in self.columns.items()})
+        for field in UPLOAD_FIELDS:
+            if field not in df.columns:
+                df[field] = None
+        return df
+
+def domain_key(axis_id, domain_id):
+    """Key identifying a domain across axes (domain ids restart in every axis)."""
+    return f"{axis_id}-{domain_id}"
+
+# Scoring weights keyed by objective id, domain key and axis id.
+# Anything not listed weighs 1, which gives the plain means. The object is never
+# modified: a weight change publishes a new one, so readers see old or new weights whole.
+scoring_weights = {
+    "objectives": {},
+    "domains": {},
+    "axes": {}
+}
+
+class ScoringEngine:
+    """Weighted GCMM scores over an objective x domain / objective x axis incidence matrix.
+
+    A domain score is the weighted mean of its objectives, an axis score the
+    weighted mean of its objectives (objective weight times domain weight) and
+    the global score the weighted mean of the axis scores. ``score`` accepts a
+    batch of profile vectors, so what-if scenarios cost one matrix product.
+    """
+
+    def __init__(self, data, weights):
+        import numpy as np
+
+        objectives = data["objectives"]
+        self.weights = weights
+        self.structure = scoring_structure(data)
+        self.domain_keys = [domain_key(d["axisId"], d["id"]) for d in data["domains"]]
+        self.axis_ids = [str(a["id"]) for a in data["axes"]]
+        self.objective_index = {str(o["id"]): i for i, o in enumerate(objectives)}
+
+        domain_positions = {key: j for j, key in enumerate(self.domain_keys)}
+        axis_positions = {axis_id: j for j, axis_id in enumerate(self.axis_ids)}
+
+        self.domain_matrix = np.zeros((len(objectives), len(self.domain_keys)))
+        self.axis_matrix = np.zeros((len(objectives), len(self.axis_ids)))
+        for i, objective in enumerate(objectives):
+            key = domain_key(objective["axisId"], objective["domainId"])
+            objective_weight = float(weights["objectives"].get(str(objective["id"]), 1))
+            domain_weight = float(weights["domains"].get(key, 1))
+
+            if key in domain_positions:
+                self.domain_matrix[i, domain_positions[key]] = objective_weight
+            if str(objective["axisId"]) in axis_positions:
+                self.axis_matrix[i, axis_positions[str(objective["axisId"])]] = objective_weight * domain_weight
+
+        self.domain_totals = self.domain_matrix.sum(axis=0)
+        self.axis_totals = self.axis_matrix.sum(axis=0)
+        self.axis_weights = np.array([float(weights["axes"].get(axis_id, 1)) for axis_id in self.axis_ids])
+
+    @staticmethod
+    def current_profiles(data):
+        import numpy as np
+        return np.array([o["profile"] for o in data["objectives"]], dtype=float)
+
+    @staticmethod
+    def target_profiles(data):
+        import numpy as np
+        return np.array([max(o["target_profile"], o["profile"]) for o in data["objectives"]], dtype=float)
+
+    def score(self, profiles):
+        """Score one profile vector or a (scenarios x objectives) matrix.
+
+        Returns domain scores, axis scores and global scores, one row per scenario.
+        """
+        import numpy as np
+
+        profiles = np.atleast_2d(np.asarray(profiles, dtype=float))
+        domain_scores = self._weighted_mean(profiles @ self.domain_matrix, self.domain_totals)
+        axis_scores = self._weighted_mean(profiles @ self.axis_matrix, self.axis_totals)
+
+        axis_weight_total = self.axis_weights.sum()
+        if axis_weight_total > 0:
+            global_scores = axis_scores @ self.axis_weights / axis_weight_total
+        else:
+            global_scores = np.zeros(len(profiles))
+
+        return domain_scores, axis_scores, global_scores
+
+    @staticmethod
+    def _weighted_mean(sums, totals):
+        import numpy as np
+        # Domains and axes without (weighted) objectives score 0
+        return np.divide(sums, totals, out=np.zeros_like(sums), where=totals > 0)
+
+def scoring_structure(data):
+    """What the incidence matrices depend on: objective placement, domains and axes."""
+    return (
+        [(str(o["id"]), str(o["axisId"]), str(o["domainId"])) for o in data["objectives"]],
+        [domain_key(d["axisId"], d["id"]) for d in data["domains"]],
+        [str(a["id"]) for a in data["axes"]]
+    )
+
+# Engine for the current store; rebuilt when the store structure or the weights change.
+# Evaluations publish new copies of the store, so the structure is compared, not identity.
+# The cache is keyed on the weights object too: an engine built from weights that were
+# replaced meanwhile is never reused, whichever thread cached it last.
+_scoring_engine = None
+
+def get_scoring_engine(data):
+    global _scoring_engine
+    weights = scoring_weights
+    engine = _scoring_engine
+    if engine is None or engine.weights is not weights or engine.structure != scoring_structure(data):
+        engine = ScoringEngine(data, weights)
+        _scoring_engine = engine
+    return engine
+
+def update_scores(data, engine=None):
+    """Recompute the domain, axis and global scores and the radar data of ``data`` in place."""
+    engine = engine or get_scoring_engine(data)
+    domain_scores, axis_scores, global_scores = engine.score(engine.current_profiles(data))
+
+    for domain, score in zip(data["domains"], domain_scores[0]):
+        domain["score"] = float(score)
+    for axis, score in zip(data["axes"], axis_scores[0]):
+        axis["score"] = float(score)
+
+    data["globalScore"] = round(float(global_scores[0]), 1)
+    data["radarData"] = [
+        {
+            "axis": f"Axe {axis['id']}: {axis['name']}",
+            "score": axis["score"],
+            "fullMark": 5,
+            "color": axis["color"]
+        }
+        for axis in data["axes"]
     ]
-    
-    # Check if we have enough columns
-    if len(df.columns) < len(required_columns):
+
+def objective_recommendations(objective):
+    """Recommendations on the way from an objective's profile to its target profile."""
+    recommendations = []
+    if objective["target_profile"] > objective["profile"]:
+        for i in range(max(objective["profile"] - 1, 0), objective["target_profile"]):
+            if i == len(objective["levels"]) - 1:
+                continue
+            level = objective["levels"][i]
+            recommendations.append({
+                "level": i + 1,
+                "actionable": level["actionable"],
+                "strategic": level["strategic"]
+            })
+    return recommendations
+
+class GapIndex:
+    """Materialized gap analysis of the assessment.
+
+    Keeps per-objective gaps (``target_profile - profile``) with their
+    applicable recommendations, gap totals per domain and axis, and sorted
+    lists (largest gap first) for the whole assessment, each axis and each
+    domain. A published index is never modified: uploads build a new one and
+    evaluations publish an updated copy from ``with_objective``.
+    """
+
+    def __init__(self, data=None):
+        self.entries = {}
+        self.positions = {}
+        self.ranking = []
+        self.axis_rankings = {}
+        self.domain_rankings = {}
+        self.axis_totals = {}
+        self.domain_totals = {}
+        if data is not None:
+            for position, objective in enumerate(data["objectives"]):
+                self.positions[str(objective["id"])] = position
+                self._insert(objective)
+
+    def with_objective(self, objective):
+        """Copy of the index with ``objective`` added or updated; this index is left untouched."""
+        index = GapIndex()
+        index.entries = dict(self.entries)
+        index.positions = dict(self.positions)
+        index.ranking = list(self.ranking)
+        index.axis_rankings = {axis: list(ranking) for axis, ranking in self.axis_rankings.items()}
+        index.domain_rankings = {domain: list(ranking) for domain, ranking in self.domain_rankings.items()}
+        index.axis_totals = dict(self.axis_totals)
+        index.domain_totals = dict(self.domain_totals)
+
+        if str(objective["id"]) not in index.positions:
+            index.positions[str(objective["id"])] = len(index.positions)
+        index._remove(str(objective["id"]))
+        index._insert(objective)
+        return index
+
+    def set_version(self, version):
+        """Stamp every entry with ``version``; only for an index that is not published yet."""
+        for entry in self.entries.values():
+            entry["version"] = version
+
+    def recommendations_for(self, objective):
+        """Cached recommendations, used only if the entry was built from this very version of the objective."""
+        entry = self.entries.get(str(objective["id"]))
+        if entry is None or entry["version"] != objective.get("version"):
+            return objective_recommendations(objective)
+        return entry["recommendations"]
+
+    def top(self, k=None, axis_id=None, domain_id=None, min_gap=1):
+        """Largest gaps first, optionally restricted to an axis or a domain."""
+        if domain_id is not None:
+            ranking = self.domain_rankings.get(domain_key(axis_id, domain_id), [])
+        elif axis_id is not None:
+            ranking = self.axis_rankings.get(str(axis_id), [])
+        else:
+            ranking = self.ranking
+
+        gaps = []
+        for negative_gap, _, objective_id in ranking:
+            if -negative_gap < min_gap or (k is not None and len(gaps) >= k):
+                break
+            gaps.append(self.entries[objective_id])
+        return gaps
+
+    def _sort_key(self, entry):
+        return (-entry["gap"], self.positions[entry["objectiveId"]], entry["objectiveId"])
+
+    def _insert(self, objective):
+        entry = {
+            "objectiveId": str(objective["id"]),
+            "version": objective.get("version"),
+            "name": objective["name"],
+            "axisId": objective["axisId"],
+            "domainId": objective["domainId"],
+            "profile": objective["profile"],
+            "targetProfile": objective["target_profile"],
+            "gap": max(objective["target_profile"] - objective["profile"], 0),
+            "recommendations": objective_recommendations(objective)
+        }
+        self.entries[entry["objectiveId"]] = entry
+
+        axis = str(entry["axisId"])
+        domain = domain_key(entry["axisId"], entry["domainId"])
+        key = self._sort_key(entry)
+        bisect.insort(self.ranking, key)
+        bisect.insort(self.axis_rankings.setdefault(axis, []), key)
+        bisect.insort(self.domain_rankings.setdefault(domain, []), key)
+        self.axis_totals[axis] = self.axis_totals.get(axis, 0) + entry["gap"]
+        self.domain_totals[domain] = self.domain_totals.get(domain, 0) + entry["gap"]
+
+    def _remove(self, objective_id):
+        entry = self.entries.pop(objective_id, None)
+        if entry is None:
+            return
+
+        axis = str(entry["axisId"])
+        domain = domain_key(entry["axisId"], entry["domainId"])
+        key = self._sort_key(entry)
+        for ranking in (self.ranking, self.axis_rankings[axis], self.domain_rankings[domain]):
+            del ranking[bisect.bisect_left(ranking, key)]
+        self.axis_totals[axis] -= entry["gap"]
+        self.domain_totals[domain] -= entry["gap"]
+
+gap_index = GapIndex()
+
+# Upload formats by file extension; all of them use the workbook column layout
+UPLOAD_FORMATS = {
+    ".xlsx": "Excel",
+    ".xls": "Excel",
+    ".csv": "CSV",
+    ".parquet": "Parquet",
+    ".arrow": "Arrow",
+    ".feather": "Arrow",
+    ".ipc": "Arrow"
+}
+
+# Export formats: file extension and content type
+EXPORT_FORMATS = {
+    "xlsx": (".xlsx", XLSX_CONTENT_TYPE),
+    "csv": (".csv", "text/csv"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file")
+}
+
+def upload_format(filename):
+    return next((name for ext, name in UPLOAD_FORMATS.items() if filename.lower().endswith(ext)), None)
+
+def read_dataframe(contents, file_format, resolver):
+    """Parse uploaded bytes into a DataFrame holding only the GCMM columns.
+
+    ``resolver`` maps the header; only the columns it selects are read.
+    Parquet and Arrow files are parsed from the upload bytes in place, without
+    an extra copy of the buffer; the selected columns are then converted to pandas
+    and cast to the resolver dtypes.
+    """
+    import pandas as pd
+
+    if file_format == "Excel":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(io.BytesIO(contents), read_only=True, data_only=True, keep_links=False)
+        try:
+            worksheet = workbook.worksheets[0]
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+            # Blank headers get the names pandas gives them
+            header = [f"Unnamed: {i}" if value is None else value for i, value in enumerate(header)]
+            resolver.resolve(header)
+            resolver.check_required()
+
+            # openpyxl still parses every row, but only cells in the span of the
+            # selected columns become values, and only the selected ones are kept
+            positions = [header.index(column) for column in resolver.usecols]
+            first, last = min(positions), max(positions)
+            records = []
+            for row in worksheet.iter_rows(min_row=2, min_col=first + 1, max_col=last + 1, values_only=True):
+                record = [row[position - first] if position - first < len(row) else None for position in positions]
+                # Empty cells are missing values, as pandas reads them
+                record = [None if value == "" else value for value in record]
+                if any(value is not None for value in record):
+                    records.append(record)
+        finally:
+            workbook.close()
+        df = pd.DataFrame(records, columns=resolver.usecols)
+        return resolver.to_fields(resolver.convert(df))
+    if file_format == "CSV":
+        resolver.resolve(pd.read_csv(io.BytesIO(contents), nrows=0).columns)
+        resolver.check_required()
+        df = pd.read_csv(io.BytesIO(contents), usecols=resolver.usecols, dtype=resolver.dtypes)
+        return resolver.to_fields(df)
+
+    import pyarrow as pa
+
+    buffer = pa.py_buffer(contents)
+    if file_format == "Parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(pa.BufferReader(buffer))
+        resolver.resolve(parquet_file.schema_arrow.names)
+        resolver.check_required()
+        table = parquet_file.read(columns=resolver.usecols)
+    else:
+        import pyarrow.ipc
+        try:
+            table = pa.ipc.open_file(buffer).read_all()
+        except pa.ArrowInvalid:
+            # Arrow streaming format rather than the random-access file format
+            table = pa.ipc.open_stream(buffer).read_all()
+        resolver.resolve(table.column_names)
+        resolver.check_required()
+        table = table.select(resolver.usecols)
+    # Arrow types come from the writer (a string #Axis, float ids), so cast like the other formats
+    return resolver.to_fields(resolver.convert(table.to_pandas()))
+
+def write_dataframe(df, export_format, sheet_name):
+    """Serialize an export DataFrame in the requested format."""
+    if export_format == "xlsx":
+        import pandas as pd
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+        return output.getvalue()
+    if export_format == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+
+    import pyarrow as pa
+
+    # Arrow needs one type per column; ids and texts may mix ints, strings and NaN
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype == object:
+            df[column] = [None if value is None or (isinstance(value, float) and math.isnan(value)) else str(value)
+                          for value in df[column]]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, sink)
+    else:
+        import pyarrow.ipc
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def export_response(records, export_format, sheet_name, filename):
+    """Build the download response for exported records."""
+    import pandas as pd
+
+    extension, content_type = EXPORT_FORMATS[export_format]
+    df = pd.DataFrame(records, columns=GCMM_COLUMNS)
+
+    try:
+        content = write_dataframe(df, export_format, sheet_name)
+    except ImportError:
+        raise HTTPException(
+            status_code=500,
+            detail="pyarrow library is required for Parquet and Arrow exports. Please install it with 'pip install pyarrow'"
+        )
+
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}{extension}"',
+        'Content-Type': content_type
+    }
+
+    return Response(content=content, headers=headers)
+
+def validate_export_format(export_format):
+    if export_format not in EXPORT_FORMATS:
         raise HTTPException(
             status_code=400,
-            detail=f"Excel file should have {len(required_columns)} columns, but found {len(df.columns)}"
+            detail=f"Invalid export format: {export_format}. Use {', '.join(EXPORT_FORMATS)}"
         )
-    
-    # Check column names (case-insensitive)
-    df_columns = [str(col).strip().lower() for col in df.columns]
-    required_columns_lower = [col.lower() for col in required_columns]
-    
-    # Find missing columns
-    missing_columns = []
-    for i, required_col in enumerate(required_columns_lower):
-        found = False
-        for df_col in df_columns:
-            if required_col in df_col:
-                found = True
+
+# English and French stop words, compared after accent folding
+STOP_WORDS = {
+    # English
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "into",
+    "is", "it", "its", "no", "not", "of", "on", "or", "such", "that", "the", "their", "there",
+    "these", "this", "to", "was", "were", "which", "will", "with",
+    # French
+    "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "elle", "en", "est", "et", "il",
+    "ils", "la", "le", "les", "leur", "leurs", "mais", "ne", "ni", "nos", "notre", "ou", "par",
+    "pas", "pour", "qui", "que", "sa", "se", "ses", "son", "sont", "sur", "un", "une", "vos", "votre"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Split English or French text into search terms.
+
+    Accents are folded ("sécurité" -> "securite"), elisions split off
+    ("l'organisation" -> "organisation"), stop words dropped and a plural
+    "s"/"x" stripped, so both languages of the interface search the same way.
+    """
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return []
+    folded = unicodedata.normalize("NFKD", str(text).lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+
+    terms = []
+    for token in TOKEN_PATTERN.findall(folded):
+        if token in STOP_WORDS or (len(token) < 2 and not token.isdigit()):
+            continue
+        if len(token) > 3 and token[-1] in "sx":
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+class SearchIndex:
+    """Inverted index over objectives and domains.
+
+    Postings map a term to the documents containing it with a field-weighted
+    term frequency (names count more than descriptions, which count more than
+    level texts and recommendations). Results are ranked by TF-IDF; the last
+    query term also matches as a prefix so results show up while typing. Like
+    the gap index, a published index is never modified.
+    """
+
+    OBJECTIVE_FIELDS = {"name": 3.0, "description": 2.0, "levels": 1.0, "recommendations": 1.0}
+    DOMAIN_FIELDS = {"name": 3.0, "description": 2.0}
+    MAX_PREFIX_TERMS = 50
+
+    def __init__(self, data=None):
+        self.documents = {}
+        self.postings = {}
+        self.document_terms = {}
+        self.vocabulary = []
+        if data is not None:
+            for domain in data["domains"]:
+                self._index(*self._domain_document(domain))
+            for objective in data["objectives"]:
+                self._index(*self._objective_document(objective))
+
+    def with_objective(self, objective):
+        """Copy of the index with ``objective`` added or reindexed; this index is left untouched.
+
+        Only the postings of the terms the objective had or now has are copied.
+        """
+        doc_id, document, weights = self._objective_document(objective)
+        index = SearchIndex()
+        index.documents = dict(self.documents)
+        index.document_terms = dict(self.document_terms)
+        index.postings = dict(self.postings)
+        index.vocabulary = list(self.vocabulary)
+        for term in weights.keys() | set(self.document_terms.get(doc_id, [])):
+            if term in index.postings:
+                index.postings[term] = dict(index.postings[term])
+        index._index(doc_id, document, weights)
+        return index
+
+    def _objective_document(self, objective):
+        """Document id, stored document and term weights of an objective."""
+        levels = objective["levels"]
+        return (
+            f"objective:{objective['id']}",
+            {
+                "type": "objective",
+                "id": str(objective["id"]),
+                "axisId": objective["axisId"],
+                "domainId": objective["domainId"],
+                "name": objective["name"],
+                "description": objective["description"]
+            },
+            self._term_weights({
+                "name": [objective["name"]],
+                "description": [objective["description"]],
+                "levels": [level["description"] for level in levels],
+                "recommendations": [level[kind] for level in levels for kind in ("actionable", "strategic")]
+            }, self.OBJECTIVE_FIELDS)
+        )
+
+    def _domain_document(self, domain):
+        return (
+            f"domain:{domain_key(domain['axisId'], domain['id'])}",
+            {
+                "type": "domain",
+                "id": str(domain["id"]),
+                "axisId": domain["axisId"],
+                "domainId": str(domain["id"]),
+                "name": domain["name"],
+                "description": domain["description"]
+            },
+            self._term_weights({"name": [domain["name"]], "description": [domain["description"]]}, self.DOMAIN_FIELDS)
+        )
+
+    @staticmethod
+    def _term_weights(fields, field_weights):
+        weights = {}
+        for field, texts in fields.items():
+            for text in texts:
+                for term in tokenize(text):
+                    weights[term] = weights.get(term, 0) + field_weights[field]
+        return weights
+
+    def search(self, query, offset=0, limit=20, kind=None, axis_id=None):
+        """Ranked matches for ``query``; returns (total, page of results)."""
+        terms = tokenize(query)
+        if not terms:
+            return 0, []
+
+        # Every term must match; the last one may also be a prefix of an indexed term.
+        # Rarest terms go first so later terms only score the remaining candidates.
+        groups = [[term] if term in self.postings else [] for term in terms[:-1]]
+        groups.sort(key=lambda group: len(self.postings[group[0]]) if group else 0)
+        groups.append(self._prefix_terms(terms[-1]))
+
+        candidates = None
+        scores = {}
+        for group in groups:
+            term_scores = {}
+            for term in group:
+                postings = self.postings[term]
+                idf = math.log(1 + len(self.documents) / len(postings))
+                # Exact matches rank above prefix completions
+                boost = 1.0 if term in terms else 0.5
+                if candidates is not None and len(candidates) < len(postings):
+                    hits = ((doc_id, postings[doc_id]) for doc_id in candidates if doc_id in postings)
+                else:
+                    hits = postings.items()
+                for doc_id, weight in hits:
+                    term_scores[doc_id] = term_scores.get(doc_id, 0) + weight * idf * boost
+
+            candidates = set(term_scores) if candidates is None else candidates & term_scores.keys()
+            if not candidates:
+                return 0, []
+            for doc_id in candidates:
+                scores[doc_id] = scores.get(doc_id, 0) + term_scores[doc_id]
+
+        matches = [
+            doc_id for doc_id in candidates
+            if (kind is None or self.documents[doc_id]["type"] == kind)
+            and (axis_id is None or str(self.documents[doc_id]["axisId"]) == str(axis_id))
+        ]
+        ranked = heapq.nsmallest(offset + limit, matches, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+        return len(matches), [
+            {**self.documents[doc_id], "score": round(scores[doc_id], 4)}
+            for doc_id in ranked[offset:]
+        ]
+
+    def _index(self, doc_id, document, weights):
+        self._remove(doc_id)
+
+        self.documents[doc_id] = document
+        self.document_terms[doc_id] = list(weights)
+        for term, weight in weights.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            self.postings[term][doc_id] = weight
+
+    def _remove(self, doc_id):
+        for term in self.document_terms.pop(doc_id, []):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.documents.pop(doc_id, None)
+
+    def _prefix_terms(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:start + self.MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
                 break
-        if not found:
-            missing_columns.append(required_columns[i])
-    if missing_columns:
+            terms.append(term)
+        return terms
+
+search_index = SearchIndex()
+
+def apply_evaluation(objective, evaluation):
+    """Apply an evaluation (profile, target_profile, comment, recommendations) to an objective."""
+    objective["profile"] = evaluation["profile"]
+    objective["target_profile"] = max(evaluation["target_profile"], evaluation["profile"])
+    objective["comment"] = evaluation["comment"]
+
+    if evaluation["recommendations"]:
+        for level_idx, level_data in evaluation["recommendations"].items():
+            level_idx = int(level_idx)
+            if 0 <= level_idx < len(objective["levels"]):
+                if "actionable" in level_data:
+                    objective["levels"][level_idx]["actionable"] = level_data["actionable"]
+                if "strategic" in level_data:
+                    objective["levels"][level_idx]["strategic"] = level_data["strategic"]
+
+class EvaluationJournal:
+    """Append-only history of the assessment.
+
+    Uploads, saves and scoring weight changes rescore the whole store and are
+    journaled as a snapshot; evaluations are journaled as events and compacted
+    into a new snapshot every SNAPSHOT_INTERVAL events. Every snapshot keeps the
+    weights in force, and a past version is rebuilt from the closest snapshot
+    plus a replay of the evaluations after it, scored with those weights. The
+    scores after every event are kept as well, so score histories need no
+    replay at all.
+    """
+
+    SNAPSHOT_INTERVAL = 50
+
+    def __init__(self):
+        self.events = []
+        self.event_times = []
+        self.snapshots = []
+        self.snapshot_seqs = []
+        self.score_history = []
+
+    # Writers hold store_lock; readers don't, so every list is appended to in an order
+    # that keeps what readers can see consistent: a snapshot before its seq, an event
+    # before its time, and a load's snapshot before the load event itself.
+
+    def record_load(self, data, source, filename=None):
+        self._snapshot(data, len(self.events) + 1)
+        self._append({"type": source, "filename": filename}, data)
+
+    def record_weights(self, data, weights):
+        self._snapshot(data, len(self.events) + 1)
+        self._append({"type": "weights", "weights": weights}, data)
+
+    def record_evaluation(self, data, objective_id, evaluation):
+        self._append({"type": "evaluation", "objectiveId": objective_id, "evaluation": evaluation}, data)
+        if self.events[-1]["seq"] - self.snapshot_seqs[-1] >= self.SNAPSHOT_INTERVAL:
+            self._snapshot(data, self.events[-1]["seq"])
+
+    def locate(self, as_of):
+        """Closest snapshot at or before ``as_of`` (a datetime) and the evaluations to replay on top of it.
+
+        None before the first load.
+        """
+        position = bisect.bisect_right(self.event_times, as_of.timestamp())
+        if position == 0 or not self.snapshots:
+            return None
+        seq = self.events[position - 1]["seq"]
+
+        snapshot_position = bisect.bisect_right(self.snapshot_seqs, seq) - 1
+        return self.snapshots[snapshot_position], self.events[self.snapshot_seqs[snapshot_position]:seq]
+
+    @staticmethod
+    def replay(source):
+        if source is None:
+            return None
+        (snapshot, weights), events = source
+
+        data = copy.deepcopy(snapshot)
+        objectives = {str(o["id"]): o for o in data["objectives"]}
+        for event in events:
+            objective = objectives[event["objectiveId"]]
+            apply_evaluation(objective, event["evaluation"])
+            objective["version"] = event["version"]
+
+        update_scores(data, ScoringEngine(data, weights))
+        return data
+
+    def scores(self, axis_id=None, start=None, end=None):
+        """Global score series, or the series of one axis."""
+        low = bisect.bisect_left(self.event_times, start.timestamp()) if start else 0
+        high = bisect.bisect_right(self.event_times, end.timestamp()) if end else len(self.event_times)
+
+        series = []
+        for entry in self.score_history[low:high]:
+            if axis_id is None:
+                score = entry["globalScore"]
+            elif str(axis_id) in entry["axes"]:
+                score = entry["axes"][str(axis_id)]
+            else:
+                continue
+            series.append({"seq": entry["seq"], "timestamp": entry["timestamp"], "score": score})
+        return series
+
+    def _append(self, event, data):
+        now = time.time()
+        event["seq"] = len(self.events) + 1
+        event["version"] = data["version"]
+        event["timestamp"] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        self.events.append(event)
+        self.event_times.append(now)
+        self.score_history.append({
+            "seq": event["seq"],
+            "timestamp": event["timestamp"],
+            "globalScore": data["globalScore"],
+            "axes": {str(axis["id"]): axis["score"] for axis in data["axes"]}
+        })
+
+    def _snapshot(self, data, seq):
+        # Published stores and scoring weights are never modified, so the snapshot shares them
+        self.snapshots.append((data, scoring_weights))
+        self.snapshot_seqs.append(seq)
+
+journal = EvaluationJournal()
+
+def parse_timestamp(value, name):
+    """Parse an ISO 8601 query parameter; naive values are taken as UTC."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}. Use an ISO 8601 date or timestamp")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def etag(version):
+    return f'"{version}"'
+
+def if_match_tags(if_match):
+    return [tag.strip().removeprefix("W/").strip('"') for tag in if_match.split(",")]
+
+def check_version(if_match, version):
+    """Optimistic concurrency: reject the write when If-Match no longer matches ``version``."""
+    if if_match is None or if_match.strip() == "*":
+        return
+    if str(version) not in if_match_tags(if_match):
         raise HTTPException(
-            status_code=400,
-            detail=f"Missing required columns: {', '.join(missing_columns)}"
+            status_code=409,
+            detail=f"Version conflict: If-Match {if_match} does not match the current version {version}"
         )
-    
-    return True
+
+def check_objective_version(if_match, version):
+    """Like check_version, for an objective whose ``version`` is the assessment version of its last change.
+
+    Besides the objective's own ETag, If-Match may carry the assessment ETag from
+    GET /api/data: that copy is only stale if the objective changed after it.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return
+    for tag in if_match_tags(if_match):
+        if tag == str(version) or (tag.isdigit() and version <= int(tag)):
+            return
+    raise HTTPException(
+        status_code=409,
+        detail=f"Version conflict: objective changed in version {version}, after If-Match {if_match}"
+    )
+
+def rescored(data):
+    """Copy of ``data`` with fresh domain, axis and global scores; ``data`` is left untouched."""
+    data = {
+        **data,
+        "domains": [dict(domain) for domain in data["domains"]],
+        "axes": [dict(axis) for axis in data["axes"]]
+    }
+    update_scores(data)
+    return data
+
+def replace_store(data, source, if_match=None, filename=None):
+    """Publish a whole new assessment (upload or save) with freshly built indexes."""
+    global gcmm_data, gap_index, search_index
+    # Building the indexes is the slow part, so it happens before taking the lock
+    gaps = GapIndex(data)
+    index = SearchIndex(data)
+    with store_lock:
+        check_version(if_match, gcmm_data["version"])
+        # An objective's version is the assessment version of its last change, so
+        # versions never repeat across loads and stale If-Match values keep failing
+        data["version"] = gcmm_data["version"] + 1
+        for objective in data["objectives"]:
+            objective["version"] = data["version"]
+        gaps.set_version(data["version"])
+        update_scores(data)
+
+        gcmm_data, gap_index, search_index = data, gaps, index
+        journal.record_load(data, source, filename)
+    return data
 
 @app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
+def upload_file(file: UploadFile = File(...), if_match: str | None = Header(None)):
+    import pandas as pd
+
     try:
         # Validate file extension
-        if not file.filename.endswith(('.xlsx', '.xls')):
+        file_format = upload_format(file.filename)
+        if file_format is None:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid file format: {file.filename}. Please upload an Excel file (.xlsx or .xls)"
+                detail=f"Invalid file format: {file.filename}. Please upload an Excel (.xlsx or .xls), CSV, Parquet or Arrow file"
             )
 
-        # Read Excel file content
+        # Read file content
         try:
-            contents = await file.read()
+            contents = file.file.read()
         except Exception as e:
             print(f"Error reading file: {str(e)}")
             raise HTTPException(
                 status_code=400,
-                detail=f"Error reading file: {str(e)}. Please make sure it's a valid Excel file."
+                detail=f"Error reading file: {str(e)}. Please make sure it's a valid {file_format} file."
             )
-        
-        # Parse Excel file
+
+        # Parse file
         try:
-            df = pd.read_excel(
-                io.BytesIO(contents),
-                engine='openpyxl'  # Explicitly use openpyxl for .xlsx files
+            df = read_dataframe(contents, file_format, ColumnResolver())
+        except HTTPException:
+            raise
+        except ImportError:
+            raise HTTPException(
+                status_code=500,
+                detail="pyarrow library is required for Parquet and Arrow files. Please install it with 'pip install pyarrow'"
             )
         except Exception as e:
-            print(f"Error parsing Excel: {str(e)}")
+            print(f"Error parsing {file_format}: {str(e)}")
             raise HTTPException(
                 status_code=400,
-                detail=f"Error parsing Excel file: {str(e)}. Please check the file format."
+                detail=f"Error parsing {file_format} file: {str(e)}. Please check the file format."
             )
-        
+
         # Validate DataFrame
         if df.empty:
             raise HTTPException(
                 status_code=400,
-                detail="The Excel file is empty"
+                detail="The uploaded file is empty"
             )
 
-        # Validate the structure of the Excel file
-        # validate_excel_structure(df)
+        rows = df.to_dict("records")
 
-        # Skip header row
-        rows = df.iloc[0:].values.tolist()
-        
-        if not rows:
-            raise HTTPException(
-                status_code=400,
-                detail="No data found in the Excel file after header row"
-            )
-        
         # Initialize empty lists
         axes = []
         domains = []
         objectives = []
 
+        def text(row, field):
+            return str(row[field]) if not pd.isna(row[field]) else ""
+
         # Process data rows
         try:
             for row in rows:
-                if not row[0]:  # Skip empty rows
+                if pd.isna(row["axis_id"]) or not row["axis_id"]:  # Skip empty rows
                     continue
-                axis_id = int(row[0]) if not pd.isna(row[0]) else None
-                axis_name = row[1]
-                domain_id = str(row[2]) if not pd.isna(row[2]) else None
-                domain_name = row[3]
-                domain_description = row[4]
-                objective_id = str(row[5]) if not pd.isna(row[5]) else None
-                objective_name = row[6]
-                description = row[7]
-                level1 = row[8]
-                level2 = row[9]
-                level3 = row[10]
-                level4 = row[11]
-                level5 = row[12]
-                profile = int(row[13]) if not pd.isna(row[13]) else 0
-                target_profile = int(row[14]) if not pd.isna(row[14]) else profile
-                comment = row[15]
-
-                # Process recommendations for each level
-                recommendations = []
-                for level in range(5):
-                    recommendations.append({
-                        "level": level + 1,
-                        "actionable": row[16 + level] if not pd.isna(row[16 + level]) else "",
-                        "strategic": row[21 + level] if not pd.isna(row[21 + level]) else ""
-                    })
-                
+                axis_id = int(row["axis_id"])
+                axis_name = row["axis_name"]
+                domain_id = id_text(row["domain_id"]) if not pd.isna(row["domain_id"]) else None
+                domain_name = row["domain_name"]
+                domain_description = row["domain_description"]
+                objective_id = id_text(row["objective_id"]) if not pd.isna(row["objective_id"]) else None
+                objective_name = row["objective_name"]
+                description = row["description"]
+                profile = int(row["profile"]) if not pd.isna(row["profile"]) else 0
+                target_profile = int(row["target_profile"]) if not pd.isna(row["target_profile"]) else profile
+                comment = row["comment"]
+
                 # Add axis if it doesn't exist
                 if axis_id and not any(a["id"] == axis_id for a in axes):
                     axes.append({
@@ -185,10 +1094,10 @@ async def upload_file(file: UploadFile = File(...)):
                 
                 # Add domain if it doesn't exist
                 if domain_id and domain_name:
-                    domain_key = f"{axis_id}-{domain_id}"
-                    if not any(d["key"] == domain_key for d in domains):
+                    key = domain_key(axis_id, domain_id)
+                    if not any(d["key"] == key for d in domains):
                         domains.append({
-                            "key": domain_key,
+                            "key": key,
                             "id": domain_id,
                             "name": domain_name,
                             "description": domain_description,
@@ -206,35 +1115,12 @@ async def upload_file(file: UploadFile = File(...)):
                         "axisId": axis_id,
                         "levels": [
                             {
-                                "level": 1,
-                                "description": level1,
-                                "actionable": str(row[16]) if not pd.isna(row[16]) else "",
-                                "strategic": str(row[21]) if not pd.isna(row[21]) else ""
-                            },
-                            {
-                                "level": 2,
-                                "description": level2,
-                                "actionable": str(row[17]) if not pd.isna(row[17]) else "",
-                                "strategic": str(row[22]) if not pd.isna(row[22]) else ""
-                            },
-                            {
-                                "level": 3,
-                                "description": level3,
-                                "actionable": str(row[18]) if not pd.isna(row[18]) else "",
-                                "strategic": str(row[23]) if not pd.isna(row[23]) else ""
-                            },
-                            {
-                                "level": 4,
-                                "description": level4,
-                                "actionable": str(row[19]) if not pd.isna(row[19]) else "",
-                                "strategic": str(row[24]) if not pd.isna(row[24]) else ""
-                            },
-                            {
-                                "level": 5,
-                                "description": level5,
-                                "actionable": str(row[20]) if not pd.isna(row[20]) else "",
-                                "strategic": str(row[25]) if not pd.isna(row[25]) else ""
+                                "level": level,
+                                "description": row[f"level{level}"],
+                                "actionable": text(row, f"actionable{level}"),
+                                "strategic": text(row, f"strategic{level}")
                             }
+                            for level in range(1, 6)
                         ],
                         "profile": profile,
                         "target_profile": target_profile,
@@ -244,47 +1130,23 @@ async def upload_file(file: UploadFile = File(...)):
             print(f"Error processing data: {str(e)}")
             raise HTTPException(
                 status_code=400,
-                detail=f"Error processing data: {str(e)}. Please check your Excel file format."
+                detail=f"Error processing data: {str(e)}. Please check your file format."
             )
 
-        # Calculate scores and update data
+        # Calculate scores and save processed data
         try:
-            # Calculate domain scores
-            for domain in domains:
-                domain_objectives = [o for o in objectives 
-                                if o["axisId"] == domain["axisId"] 
-                                and o["domainId"] == domain["id"]]
-                
-                if domain_objectives:
-                    domain["score"] = sum(o["profile"] for o in domain_objectives) / len(domain_objectives)
-            
-            # Calculate axis scores
-            for axis in axes:
-                axis_objectives = [o for o in objectives if o["axisId"] == axis["id"]]
-                
-                if axis_objectives:
-                    axis["score"] = sum(o["profile"] for o in axis_objectives) / len(axis_objectives)
-            
-            # Calculate global score
-            global_score = sum(axis["score"] for axis in axes) / len(axes) if axes else 0
-            
-            # Prepare radar data
-            radar_data = [
+            processed_data = replace_store(
                 {
-                    "axis": f"Axe {axis['id']}: {axis['name']}",
-                    "score": axis["score"],
-                    "fullMark": 5,
-                    "color": axis["color"]
-                }
-                for axis in axes
-            ]
-            
-            # Save processed data
-            gcmm_data["axes"] = axes
-            gcmm_data["domains"] = domains
-            gcmm_data["objectives"] = objectives
-            gcmm_data["globalScore"] = round(global_score, 1)
-            gcmm_data["radarData"] = radar_data
+                    "axes": axes,
+                    "domains": domains,
+                    "objectives": objectives
+                },
+                "upload",
+                if_match,
+                file.filename
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error calculating scores: {str(e)}")
             raise HTTPException(
@@ -292,14 +1154,18 @@ async def upload_file(file: UploadFile = File(...)):
                 detail=f"Error calculating scores: {str(e)}"
             )
         
-        return {
-            "message": "File processed successfully",
-            "filename": file.filename,
-            "processedRows": len(rows),
-            "axes": len(axes),
-            "domains": len(domains),
-            "objectives": len(objectives)
-        }
+        return JSONResponse(
+            content={
+                "message": "File processed successfully",
+                "filename": file.filename,
+                "processedRows": len(rows),
+                "axes": len(axes),
+                "domains": len(domains),
+                "objectives": len(objectives),
+                "version": processed_data["version"]
+            },
+            headers={"ETag": etag(processed_data["version"])}
+        )
     
     except HTTPException:
         raise
@@ -315,16 +1181,43 @@ def handle_nan_values(obj):
         return {key: handle_nan_values(value) for key, value in obj.items()}
     elif isinstance(obj, list):
         return [handle_nan_values(item) for item in obj]
-    elif isinstance(obj, (float, np.float64)) and (np.isnan(obj) or np.isinf(obj)):
+    elif isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
         return None
-    elif pd.isna(obj):
+    elif obj is None or isinstance(obj, (str, int)):
+        return obj
+
+    # Only values that came out of a DataFrame (NaT, NA, ...) need pandas
+    import pandas as pd
+    if pd.isna(obj):
         return None
     return obj
 
 @app.get("/api/data")
-async def get_data():
-    cleaned_data = handle_nan_values(gcmm_data)
-    return JSONResponse(content=cleaned_data)
+def get_data(as_of: str | None = Query(None, alias="asOf")):
+    if as_of is None:
+        data = gcmm_data
+        return JSONResponse(content=handle_nan_values(data), headers={"ETag": etag(data["version"])})
+
+    as_of = parse_timestamp(as_of, "asOf")
+    data = journal.replay(journal.locate(as_of))
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"No assessment data as of {as_of}")
+    return JSONResponse(content=handle_nan_values(data))
+
+@app.get("/api/history/scores")
+def get_score_history(
+    axis: str | None = None,
+    start: str | None = Query(None, alias="from"),
+    end: str | None = Query(None, alias="to")
+):
+    """Score after every journaled change: the global score, or one axis with ``axis``."""
+    start, end = parse_timestamp(start, "from"), parse_timestamp(end, "to")
+    series = journal.scores(axis, start, end)
+
+    return JSONResponse(content={
+        "axis": axis,
+        "series": series
+    })
 
 class ObjectiveEvaluation(BaseModel):
     objectiveId: str
@@ -334,217 +1227,369 @@ class ObjectiveEvaluation(BaseModel):
     recommendations: dict = {}
 
 @app.post("/api/objectives/{objective_id}/evaluate")
-async def evaluate_objective(objective_id: str, evaluation: ObjectiveEvaluation):
+def evaluate_objective(objective_id: str, evaluation: ObjectiveEvaluation, if_match: str | None = Header(None)):
+    """Save an evaluation; If-Match carries the objective or assessment version the client last saw."""
+    global gcmm_data, gap_index, search_index
     try:
-        # Find the objective
-        objective = next((obj for obj in gcmm_data["objectives"] if obj["id"] == objective_id), None)
-        if not objective:
-            raise HTTPException(status_code=404, detail="Objective not found")
-        # Update the objective
-        objective["profile"] = evaluation.profile
-        objective["target_profile"] = max(evaluation.target_profile, evaluation.profile)
-        objective["comment"] = evaluation.comment
-
-        if evaluation.recommendations:
-            for level_idx, level_data in evaluation.recommendations.items():
-                level_idx = int(level_idx)
-                if 0 <= level_idx < len(objective["levels"]):
-                    if "actionable" in level_data:
-                        objective["levels"][level_idx]["actionable"] = level_data["actionable"]
-                    if "strategic" in level_data:
-                        objective["levels"][level_idx]["strategic"] = level_data["strategic"]
-
-        # Update domain scores
-        for domain in gcmm_data["domains"]:
-            domain_objectives = [o for o in gcmm_data["objectives"] 
-                            if o["axisId"] == domain["axisId"] 
-                            and o["domainId"] == domain["id"]]
-            
-            if domain_objectives:
-                domain["score"] = sum(o["profile"] for o in domain_objectives) / len(domain_objectives)
-        
-        # Update axis scores
-        for axis in gcmm_data["axes"]:
-            axis_objectives = [o for o in gcmm_data["objectives"] if o["axisId"] == axis["id"]]
-            
-            if axis_objectives:
-                axis["score"] = sum(o["profile"] for o in axis_objectives) / len(axis_objectives)
-        
-        # Update global score
-        global_score = sum(axis["score"] for axis in gcmm_data["axes"]) / len(gcmm_data["axes"]) if gcmm_data["axes"] else 0
-        gcmm_data["globalScore"] = round(global_score, 1)
+        changes = evaluation.model_dump(exclude={"objectiveId"})
 
-        # Update radar data
-        gcmm_data["radarData"] = [
-            {
-                "axis": f"Axe {axis['id']}: {axis['name']}",
-                "score": axis["score"],
-                "fullMark": 5,
-                "color": axis["color"]
-            }
-            for axis in gcmm_data["axes"]
-        ]
+        with store_lock:
+            data = gcmm_data
 
-        return JSONResponse(content={
-            "message": "Evaluation saved successfully",
-            "objective": objective
-        })
+            # Find the objective
+            position = next((i for i, obj in enumerate(data["objectives"]) if obj["id"] == objective_id), None)
+            if position is None:
+                raise HTTPException(status_code=404, detail="Objective not found")
+            check_objective_version(if_match, data["objectives"][position]["version"])
 
+            # Update a copy of the objective
+            objective = copy.deepcopy(data["objectives"][position])
+            apply_evaluation(objective, changes)
+            objective["version"] = data["version"] + 1
+
+            objectives = list(data["objectives"])
+            objectives[position] = objective
+
+            # Update domain, axis and global scores and the indexes, then publish
+            data = rescored({**data, "objectives": objectives, "version": data["version"] + 1})
+            gcmm_data, gap_index, search_index = (
+                data, gap_index.with_objective(objective), search_index.with_objective(objective)
+            )
+            journal.record_evaluation(data, objective_id, changes)
+
+        return JSONResponse(
+            content={
+                "message": "Evaluation saved successfully",
+                "objective": objective
+            },
+            headers={"ETag": etag(objective["version"])}
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error saving evaluation: {str(e)}"
         )
 
+class ScoringWeights(BaseModel):
+    objectives: dict[str, float] = {}
+    domains: dict[str, float] = {}
+    axes: dict[str, float] = {}
+
+def validate_weights(weights: ScoringWeights):
+    for group in ("objectives", "domains", "axes"):
+        invalid = [key for key, value in getattr(weights, group).items() if not math.isfinite(value) or value < 0]
+        if invalid:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Weights must be finite and not negative ({group}: {', '.join(invalid)})"
+            )
+
+@app.get("/api/scoring/weights")
+async def get_scoring_weights():
+    return JSONResponse(content=scoring_weights)
+
+@app.put("/api/scoring/weights")
+def update_scoring_weights(weights: ScoringWeights, if_match: str | None = Header(None)):
+    """Replace the scoring weights and rescore the current assessment."""
+    global scoring_weights, gcmm_data
+    try:
+        validate_weights(weights)
+
+        with store_lock:
+            check_version(if_match, gcmm_data["version"])
+
+            new_weights = {
+                "objectives": dict(weights.objectives),
+                "domains": dict(weights.domains),
+                "axes": dict(weights.axes)
+            }
+            scoring_weights = new_weights
+
+            data = rescored({**gcmm_data, "version": gcmm_data["version"] + 1})
+            gcmm_data = data
+            journal.record_weights(data, scoring_weights)
+
+        return JSONResponse(
+            content={
+                "message": "Scoring weights saved successfully",
+                "weights": new_weights,
+                "globalScore": data["globalScore"]
+            },
+            headers={"ETag": etag(data["version"])}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error saving weights: {str(e)}")
+
+# Upper bounds for a single simulation call: scenarios, and scenarios x objectives
+# (each profile or score matrix costs 8 bytes per cell)
+MAX_SIMULATION_SCENARIOS = 100000
+MAX_SIMULATION_CELLS = 1000000
+
+class SimulationRequest(BaseModel):
+    # "custom": current profiles with the given per-objective overrides, one scenario per entry
+    # "target": every objective reaches its target profile
+    # "random": each objective lands uniformly between its profile and its target
+    scenario: str = "custom"
+    profiles: list[dict[str, int]] = []
+    count: int = 1000
+    seed: int | None = None
+    weights: ScoringWeights | None = None
+    # Per-scenario scores; defaults to on, except for random scenarios
+    includeScenarios: bool | None = None
+    includeDomains: bool = False
+
+def check_simulation_size(scenarios, objectives):
+    if scenarios > MAX_SIMULATION_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_SIMULATION_SCENARIOS} scenarios can be simulated at once"
+        )
+    if scenarios * objectives > MAX_SIMULATION_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many scenarios for {objectives} objectives: at most {MAX_SIMULATION_CELLS // max(objectives, 1)} can be simulated at once"
+        )
+
+def summarize_scores(scores):
+    import numpy as np
+
+    if len(scores) == 0:
+        return {}
+    p5, p50, p95 = np.percentile(scores, [5, 50, 95])
+    return {
+        "mean": float(scores.mean()),
+        "min": float(scores.min()),
+        "p5": float(p5),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(scores.max())
+    }
+
+@app.post("/api/simulate")
+def simulate_scores(request: SimulationRequest):
+    """Score hypothetical profile vectors in one batch without touching the stored assessment."""
+    import numpy as np
+
+    try:
+        data = gcmm_data
+        if request.weights is not None:
+            validate_weights(request.weights)
+            engine = ScoringEngine(data, request.weights.model_dump())
+        else:
+            engine = get_scoring_engine(data)
+
+        current = engine.current_profiles(data)
+
+        if request.scenario == "custom":
+            check_simulation_size(len(request.profiles), len(current))
+            profiles = np.tile(current, (max(len(request.profiles), 1), 1))
+            for row, overrides in enumerate(request.profiles):
+                unknown = [oid for oid in overrides if oid not in engine.objective_index]
+                if unknown:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Unknown objectives in scenario {row}: {', '.join(unknown)}"
+                    )
+                out_of_range = [oid for oid, profile in overrides.items() if not 0 <= profile <= 5]
+                if out_of_range:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Profiles must be between 0 and 5 in scenario {row}: {', '.join(out_of_range)}"
+                    )
+                columns = [engine.objective_index[oid] for oid in overrides]
+                profiles[row, columns] = list(overrides.values())
+        elif request.scenario == "target":
+            # Stored profiles are not validated, so generated scenarios are kept in range
+            profiles = np.clip(engine.target_profiles(data)[np.newaxis, :], 0, 5)
+        elif request.scenario == "random":
+            if request.count < 1:
+                raise HTTPException(status_code=400, detail="count must be at least 1")
+            check_simulation_size(request.count, len(current))
+            rng = np.random.default_rng(request.seed)
+            profiles = rng.integers(
+                current.astype(int),
+                engine.target_profiles(data).astype(int) + 1,
+                size=(request.count, len(current))
+            ).astype(float)
+            profiles = np.clip(profiles, 0, 5)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown scenario: {request.scenario}. Use custom, target or random"
+            )
+
+        domain_scores, axis_scores, global_scores = engine.score(profiles)
+
+        result = {
+            "scenario": request.scenario,
+            "count": len(profiles),
+            "summary": {
+                "globalScore": summarize_scores(global_scores),
+                "axes": {
+                    axis_id: summarize_scores(axis_scores[:, j])
+                    for j, axis_id in enumerate(engine.axis_ids)
+                }
+            }
+        }
+
+        include_scenarios = request.includeScenarios
+        if include_scenarios is None:
+            include_scenarios = request.scenario != "random"
+
+        if include_scenarios:
+            scenarios = []
+            for row in range(len(profiles)):
+                scenario = {
+                    "globalScore": round(float(global_scores[row]), 1),
+                    "axes": dict(zip(engine.axis_ids, axis_scores[row].tolist()))
+                }
+                if request.includeDomains:
+                    scenario["domains"] = dict(zip(engine.domain_keys, domain_scores[row].tolist()))
+                scenarios.append(scenario)
+            result["scenarios"] = scenarios
+
+        return JSONResponse(content=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error during simulation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error during simulation: {str(e)}")
+
+@app.get("/api/gaps")
+def get_gaps(
+    top: int | None = Query(None, ge=1),
+    axis: str | None = None,
+    domain: str | None = None,
+    min_gap: int = Query(1, alias="minGap", ge=0)
+):
+    """Largest gaps first from the gap index, optionally limited to an axis or a domain."""
+    if domain is not None and axis is None:
+        raise HTTPException(status_code=400, detail="The axis parameter is required when filtering by domain")
+
+    index = gap_index
+    result = handle_nan_values({
+        "gaps": index.top(top, axis_id=axis, domain_id=domain, min_gap=min_gap),
+        "totals": {
+            "axes": index.axis_totals,
+            "domains": index.domain_totals
+        }
+    })
+
+    return JSONResponse(content=result)
+
+@app.get("/api/search")
+def search(
+    q: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, alias="pageSize", ge=1, le=100),
+    kind: str | None = Query(None, alias="type"),
+    axis: str | None = None
+):
+    """Full-text search over objectives, levels, recommendations and domains."""
+    if kind is not None and kind not in ("objective", "domain"):
+        raise HTTPException(status_code=400, detail=f"Invalid type: {kind}. Use objective or domain")
+
+    total, results = search_index.search(
+        q,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+        kind=kind,
+        axis_id=axis
+    )
+
+    return JSONResponse(content=handle_nan_values({
+        "query": q,
+        "total": total,
+        "page": page,
+        "pageSize": page_size,
+        "results": results
+    }))
+
+def export_record(axis, domain, objective):
+    """One workbook row for an objective, with the recommendations it still needs."""
+    record = dict.fromkeys(GCMM_COLUMNS, '')
+    record.update({
+        "#Axis": axis["id"],
+        "Axis": axis["name"],
+        "#Domain": domain["id"],
+        "Domain": domain["name"],
+        "Domain Description": domain["description"],
+        "Obj. ID": objective["id"],
+        "Objective": objective["name"],
+        "Description": objective["description"],
+        "Level 1 (Ad hoc)": objective["levels"][0]["description"],
+        "Level 2 (Initiated)": objective["levels"][1]["description"],
+        "Level 3 (Defined)": objective["levels"][2]["description"],
+        "Level 4 (Managed)": objective["levels"][3]["description"],
+        "Level 5 (Optimized)": objective["levels"][4]["description"],
+        "Profil": objective["profile"],
+        "Target Profil": objective["target_profile"],
+        "Comment": objective["comment"]
+    })
+    for recommendation in gap_index.recommendations_for(objective):
+        record[f"Actionable Recommendation for Level {recommendation['level']}"] = recommendation["actionable"]
+        record[f"Strategic Recommendation for Level {recommendation['level']}"] = recommendation["strategic"]
+    return record
+
 @app.get("/api/export")
-async def export_excel():
-    """Export the current GCMM data to an Excel file."""
-    try:        
+def export_excel(export_format: str = Query("xlsx", alias="format")):
+    """Export the current GCMM data as an Excel, CSV, Parquet or Arrow file."""
+    try:
+        validate_export_format(export_format)
+        data = gcmm_data
+
         # Create a list of all records
         records = []
-        for axis in gcmm_data["axes"]:
-            axis_domains = [d for d in gcmm_data["domains"] if d["axisId"] == axis["id"]]
+        for axis in data["axes"]:
+            axis_domains = [d for d in data["domains"] if d["axisId"] == axis["id"]]
             for domain in axis_domains:
                 # Get objectives for this specific domain
-                domain_objectives = [o for o in gcmm_data["objectives"] 
+                domain_objectives = [o for o in data["objectives"] 
                                   if o["domainId"] == domain["id"] and o["axisId"] == axis["id"]]
                 for objective in domain_objectives:
-                    record = {
-                        "#Axis": axis["id"],
-                        "Axis": axis["name"],
-                        "#Domain": domain["id"],
-                        "Domain": domain["name"],
-                        "Domain Description": domain["description"],
-                        "Obj. ID": objective["id"],
-                        "Objective": objective["name"],
-                        "Description": objective["description"],
-                        "Level 1 (Ad hoc)": objective["levels"][0]["description"],
-                        "Level 2 (Initiated)": objective["levels"][1]["description"],
-                        "Level 3 (Defined)": objective["levels"][2]["description"],
-                        "Level 4 (Managed)": objective["levels"][3]["description"],
-                        "Level 5 (Optimized)": objective["levels"][4]["description"],
-                        "Profil": objective["profile"],
-                        "Target Profil": objective["target_profile"],
-                        "Comment": objective["comment"],
-                        "Actionable Recommendation for Level 1": '',
-                        "Strategic Recommendation for Level 1": '',
-                        "Actionable Recommendation for Level 2": '',
-                        "Strategic Recommendation for Level 2": '',
-                        "Actionable Recommendation for Level 3": '',
-                        "Strategic Recommendation for Level 3": '',
-                        "Actionable Recommendation for Level 4": '',
-                        "Strategic Recommendation for Level 4": ''
-                    }
-                    # Only add recommendations if target_profile is greater than profile
-                    if objective["target_profile"] > objective["profile"]:
-                        # Add recommendations from current profile to target profile
-                        for i in range(objective["profile"]-1, objective["target_profile"]):
-                            if i == len(objective["levels"])-1:
-                                continue
-                            level = objective["levels"][i]
-                            record[f"Actionable Recommendation for Level {i+1}"] = level["actionable"]
-                            record[f"Strategic Recommendation for Level {i+1}"] = level["strategic"]
-                    
-                    records.append(record)
+                    records.append(export_record(axis, domain, objective))
 
-        # Create DataFrame and write to Excel
-        df = pd.DataFrame(records)
-        
-        # Create an in-memory Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='GCMM')
-        
-        # Get the value of the BytesIO buffer
-        excel_data = output.getvalue()
-        
-        headers = {
-            'Content-Disposition': 'attachment; filename="GCMM_Export.xlsx"',
-            'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        }
-        
-        return Response(content=excel_data, headers=headers)
-    
+        return export_response(records, export_format, 'GCMM', 'GCMM_Export')
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error during export: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/axes/{axis_id}/export")
-async def export_axis_excel(axis_id: int):
-    """Export a specific axis data to an Excel file."""
+def export_axis_excel(axis_id: int, export_format: str = Query("xlsx", alias="format")):
+    """Export a specific axis data as an Excel, CSV, Parquet or Arrow file."""
     try:
+        validate_export_format(export_format)
+        data = gcmm_data
+
         # Verify axis exists
-        axis = next((a for a in gcmm_data["axes"] if a["id"] == axis_id), None)
+        axis = next((a for a in data["axes"] if a["id"] == axis_id), None)
         if not axis:
             raise HTTPException(status_code=404, detail=f"Axis {axis_id} not found")
             
         # Create a list of records for this axis only
         records = []
-        axis_domains = [d for d in gcmm_data["domains"] if d["axisId"] == axis_id]
+        axis_domains = [d for d in data["domains"] if d["axisId"] == axis_id]
         
         for domain in axis_domains:
             # Get objectives for this specific domain
-            domain_objectives = [o for o in gcmm_data["objectives"] 
+            domain_objectives = [o for o in data["objectives"] 
                                if o["domainId"] == domain["id"] and o["axisId"] == axis_id]
             
             for objective in domain_objectives:
-                record = {
-                    "#Axis": axis["id"],
-                    "Axis": axis["name"],
-                    "#Domain": domain["id"],
-                    "Domain": domain["name"],
-                    "Domain Description": domain["description"],
-                    "Obj. ID": objective["id"],
-                    "Objective": objective["name"],
-                    "Description": objective["description"],
-                    "Level 1 (Ad hoc)": objective["levels"][0]["description"],
-                    "Level 2 (Initiated)": objective["levels"][1]["description"],
-                    "Level 3 (Defined)": objective["levels"][2]["description"],
-                    "Level 4 (Managed)": objective["levels"][3]["description"],
-                    "Level 5 (Optimized)": objective["levels"][4]["description"],
-                    "Profil": objective["profile"],
-                    "Target Profil": objective["target_profile"],
-                    "Comment": objective["comment"],
-                    "Actionable Recommendation for Level 1": '',
-                    "Strategic Recommendation for Level 1": '',
-                    "Actionable Recommendation for Level 2": '',
-                    "Strategic Recommendation for Level 2": '',
-                    "Actionable Recommendation for Level 3": '',
-                    "Strategic Recommendation for Level 3": '',
-                    "Actionable Recommendation for Level 4": '',
-                    "Strategic Recommendation for Level 4": ''
-                }
-                
-                # Add recommendations columns
-                if objective["target_profile"] > objective["profile"]:
-                    # Add recommendations from current profile to target profile
-                    for i in range(objective["profile"]-1, objective["target_profile"]):
-                        if i == len(objective["levels"])-1:
-                            continue
-                        level = objective["levels"][i]
-                        record[f"Actionable Recommendation for Level {i+1}"] = level["actionable"]
-                        record[f"Strategic Recommendation for Level {i+1}"] = level["strategic"]
-                
-                records.append(record)
+                records.append(export_record(axis, domain, objective))
+
+        return export_response(records, export_format, f'Axis {axis_id}', f'GCMM_Axis_{axis_id}_Export')
 
-        # Create DataFrame and write to Excel
-        df = pd.DataFrame(records)
-        
-        # Create an in-memory Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name=f'Axis {axis_id}')
-        
-        # Get the value of the BytesIO buffer
-        excel_data = output.getvalue()
-        
-        headers = {
-            'Content-Disposition': f'attachment; filename="GCMM_Axis_{axis_id}_Export.xlsx"',
-            'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        }
-        
-        return Response(content=excel_data, headers=headers)
-    
     except HTTPException:
         raise
     except Exception as e:
@@ -552,7 +1597,7 @@ async def export_axis_excel(axis_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/axes/{axis_id}/report")
-async def generate_axis_report(axis_id: int):
+def generate_axis_report(axis_id: int):
     """Generate a Word report for a specific axis."""
     try:
         from docx import Document
@@ -560,13 +1605,14 @@ async def generate_axis_report(axis_id: int):
         from docx.enum.text import WD_ALIGN_PARAGRAPH
         
         # Verify axis exists
-        axis = next((a for a in gcmm_data["axes"] if a["id"] == axis_id), None)
+        data = gcmm_data
+        axis = next((a for a in data["axes"] if a["id"] == axis_id), None)
         if not axis:
             raise HTTPException(status_code=404, detail=f"Axis {axis_id} not found")
 
         # Get axis data
-        axis_domains = [d for d in gcmm_data["domains"] if d["axisId"] == axis_id]
-        axis_objectives = [o for o in gcmm_data["objectives"] if o["axisId"] == axis_id]
+        axis_domains = [d for d in data["domains"] if d["axisId"] == axis_id]
+        axis_objectives = [o for o in data["objectives"] if o["axisId"] == axis_id]
         
         # Create a new Word document
         doc = Document()
@@ -596,16 +1642,13 @@ async def generate_axis_report(axis_id: int):
                 # Add recommendations if target_profile > profile
                 if objective["target_profile"] > objective["profile"]:
                     doc.add_heading('Recommendations', level=4)
-                    for i in range(objective["profile"]-1, objective["target_profile"]):
-                        if i == len(objective["levels"])-1:
-                            continue
-                        level = objective["levels"][i]
-                        if level["actionable"] or level["strategic"]:
-                            doc.add_paragraph(f'Level {i+1}:', style='Heading 5')
-                            if level["actionable"]:
-                                doc.add_paragraph(f'Actionable: {level["actionable"]}')
-                            if level["strategic"]:
-                                doc.add_paragraph(f'Strategic: {level["strategic"]}')
+                    for recommendation in gap_index.recommendations_for(objective):
+                        if recommendation["actionable"] or recommendation["strategic"]:
+                            doc.add_paragraph(f'Level {recommendation["level"]}:', style='Heading 5')
+                            if recommendation["actionable"]:
+                                doc.add_paragraph(f'Actionable: {recommendation["actionable"]}')
+                            if recommendation["strategic"]:
+                                doc.add_paragraph(f'Strategic: {recommendation["strategic"]}')
         
         # Save the document to a BytesIO object
         output = io.BytesIO()
@@ -631,73 +1674,48 @@ async def generate_axis_report(axis_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def build_template_bytes():
+    """Build the empty GCMM template workbook."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'GCMM Template'
+    worksheet.append(GCMM_COLUMNS)
+
+    # Same header look and column widths as the pandas/openpyxl writer produced
+    thin = Side(style='thin')
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        worksheet.column_dimensions[cell.column_letter].width = min(len(cell.value) + 2, 50)
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+def get_template_bytes():
+    """Return the template workbook, building it on first use."""
+    global _template_bytes
+    if _template_bytes is None:
+        with _template_lock:
+            if _template_bytes is None:
+                _template_bytes = build_template_bytes()
+    return _template_bytes
+
 @app.get("/api/template")
 async def download_template():
     """Download a template Excel file for GCMM data."""
     try:
-        # Create template data
-        template_data = [
-            {
-                "#Axis": "",
-                "Axis": "",
-                "#Domain": "",
-                "Domain": "",
-                "Domain Description": "",
-                "Obj. ID": "",
-                "Objective": "",
-                "Description": "",
-                "Level 1 (Ad hoc)": "",
-                "Level 2 (Initiated)": "",
-                "Level 3 (Defined)": "",
-                "Level 4 (Managed)": "",
-                "Level 5 (Optimized)": "",
-                "Profil": "",
-                "Target Profil": "",
-                "Comment": "",
-                "Actionable Recommendation for Level 1": "",
-                "Strategic Recommendation for Level 1": "",
-                "Actionable Recommendation for Level 2": "",
-                "Strategic Recommendation for Level 2": "",
-                "Actionable Recommendation for Level 3": "",
-                "Strategic Recommendation for Level 3": "",
-                "Actionable Recommendation for Level 4": "",
-                "Strategic Recommendation for Level 4": ""
-            }
-        ]
-        
-        # Create DataFrame
-        df = pd.DataFrame(template_data)
-        
-        # Create Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='GCMM Template')
-            
-            # Get the worksheet
-            worksheet = writer.sheets['GCMM Template']
-            
-            # Adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        excel_data = output.getvalue()
-        
         headers = {
             'Content-Disposition': 'attachment; filename="GCMM_Template.xlsx"',
-            'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            'Content-Type': XLSX_CONTENT_TYPE
         }
-        
-        return Response(content=excel_data, headers=headers)
-    
+
+        return Response(content=get_template_bytes(), headers=headers)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -731,12 +1749,9 @@ class GCMMData(BaseModel):
     axes: list[Axis]
 
 @app.post("/api/data")
-async def save_gcmm_data(data: GCMMData):
-    """Save GCMM data to the backend."""
+def save_gcmm_data(data: GCMMData, if_match: str | None = Header(None)):
+    """Save GCMM data to the backend; If-Match carries the assessment version."""
     try:
-        # Update the in-memory storage
-        global gcmm_data
-         
         # Transform the data to match our storage format
         formatted_data = {
             "axes": [],
@@ -798,48 +1813,24 @@ async def save_gcmm_data(data: GCMMData):
             print(f"Error in data transformation: {str(e)}")  # Debug print
             raise
 
-        # Calculate scores
+        # Calculate scores and update storage
         try:
-            # Calculate domain scores
-            for domain in formatted_data["domains"]:
-                domain_objectives = [o for o in formatted_data["objectives"] 
-                                  if o["axisId"] == domain["axisId"] 
-                                  and o["domainId"] == domain["id"]]
-                if domain_objectives:
-                    domain["score"] = sum(o["profile"] for o in domain_objectives) / len(domain_objectives)
-            
-            # Calculate axis scores
-            for axis in formatted_data["axes"]:
-                axis_objectives = [o for o in formatted_data["objectives"] 
-                                 if o["axisId"] == axis["id"]]
-                if axis_objectives:
-                    axis["score"] = sum(o["profile"] for o in axis_objectives) / len(axis_objectives)
-
-            # Calculate global score
-            if formatted_data["axes"]:
-                formatted_data["globalScore"] = sum(axis["score"] for axis in formatted_data["axes"]) / len(formatted_data["axes"])
-            
-            # Add radar data
-            formatted_data["radarData"] = [
-                {
-                    "axis": f"Axe {axis['id']}: {axis['name']}",
-                    "score": axis["score"],
-                    "fullMark": 5,
-                    "color": axis["color"]
-                }
-                for axis in formatted_data["axes"]
-            ]
+            formatted_data = replace_store(formatted_data, "save", if_match)
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error in score calculation: {str(e)}")  # Debug print
             raise
 
-        # Update storage
-        gcmm_data.update(formatted_data)
-
-        return JSONResponse(content={
-            "message": "GCMM data saved successfully",
-            "data": formatted_data
-        })
+        return JSONResponse(
+            content={
+                "message": "GCMM data saved successfully",
+                "data": formatted_data
+            },
+            headers={"ETag": etag(formatted_data["version"])}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ERROR in save_gcmm_data: {str(e)}")  # Debug print
         import traceback